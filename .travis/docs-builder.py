@@ -1,24 +1,56 @@
 #!/usr/bin/env python
 
 import argparse
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+import glob
 import subprocess
+import tempfile
+import threading
 import os
 import re
+import shlex
 from shutil import rmtree
-import tempfile
 
 WORKING_DIR = os.environ["TRAVIS_BUILD_DIR"]
 
-VERSION_REGEX = r"(\s*)(version)(\s*)(=)(\s*)(['\"])(.*)(['\"])(.*)"
-RELEASE_REGEX = r"(\s*)(release)(\s*)(=)(\s*)(['\"])(.*)(['\"])(.*)"
+VERSION_RE = re.compile(r"(\s*)(version)(\s*)(=)(\s*)(['\"])(.*)(['\"])(.*)")
+RELEASE_RE = re.compile(r"(\s*)(release)(\s*)(=)(\s*)(['\"])(.*)(['\"])(.*)")
+ALPHA_RE = re.compile(r"[a-zA-Z]")
 
 USERNAME = "doc_builder_pulp_ansible"
 HOSTNAME = "8.43.85.236"
 
 SITE_ROOT = "/var/www/docs.pulpproject.org/pulp_ansible/"
 
+REMOTE_HOST = f"{USERNAME}@{HOSTNAME}"
+REMOTE_ROOT = f"{REMOTE_HOST}:{SITE_ROOT}"
+
+RSYNC_WORKERS = min(4, os.cpu_count() or 1)
+
+# All ssh and rsync invocations share a single multiplexed connection to the docs host
+SSH_COMMAND = [
+    "ssh",
+    "-o",
+    "ControlMaster=auto",
+    "-o",
+    f"ControlPath=/tmp/cm-{os.getpid()}-%r@%h:%p",
+    "-o",
+    "ControlPersist=120s",
+]
 
-def make_directory_with_rsync(remote_paths_list):
+
+def open_ssh_master_connection():
+    """
+    Open the SSH master connection reused by every ssh and rsync call.
+
+    The connection is closed when the interpreter exits.
+    """
+    subprocess.run(SSH_COMMAND + ["-MNf", REMOTE_HOST], check=True)
+    atexit.register(subprocess.run, SSH_COMMAND + ["-O", "exit", REMOTE_HOST])
+
+
+def make_remote_directory(remote_paths_list):
     """
     Ensure the remote directory path exists.
 
@@ -26,27 +58,108 @@ def make_directory_with_rsync(remote_paths_list):
         remote.
     :type remote_paths_list: a list of strings, with each string representing a directory.
     """
-    try:
-        tempdir_path = tempfile.mkdtemp()
-        cwd = os.getcwd()
-        os.chdir(tempdir_path)
-        os.makedirs(os.sep.join(remote_paths_list))
-        remote_path_arg = "%s@%s:%s%s" % (USERNAME, HOSTNAME, SITE_ROOT, remote_paths_list[0])
-        local_path_arg = tempdir_path + os.sep + remote_paths_list[0] + os.sep
-        rsync_command = ["rsync", "-avzh", local_path_arg, remote_path_arg]
-        exit_code = subprocess.call(rsync_command)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while creating remote directories.")
-    finally:
-        rmtree(tempdir_path)
-        os.chdir(cwd)
+    remote_path = SITE_ROOT + "/".join(remote_paths_list)
+    ssh_command = SSH_COMMAND + [REMOTE_HOST, "mkdir", "-p", shlex.quote(remote_path)]
+    subprocess.run(ssh_command, check=True)
+
+
+def parallel_rsync(local_path, remote_path, extra_flags=(), workers=RSYNC_WORKERS):
+    """
+    Push a local directory to the remote with several rsync processes working side by side.
+
+    The files under `local_path` are split round-robin into one shard per worker, and each
+    worker uploads its shard with `--files-from`. A final pass, which transfers nothing, removes
+    the remote files that no longer exist locally.
+
+    :param local_path: The local directory to push, ending with a separator.
+    :type local_path: str
+    :param remote_path: The rsync destination, e.g. user@host:/path/.
+    :type remote_path: str
+    :param extra_flags: Additional flags passed to every rsync invocation.
+    :type extra_flags: a list of strings
+    :param workers: The number of concurrent rsync processes.
+    :type workers: int
+    """
+    relative_paths = []
+    for dirpath, _, filenames in os.walk(local_path):
+        for filename in filenames:
+            relative_paths.append(os.path.relpath(os.path.join(dirpath, filename), local_path))
+    shards = [relative_paths[i::workers] for i in range(workers)]
+
+    rsync_command = [
+        "rsync",
+        "-e",
+        " ".join(SSH_COMMAND),
+        "-avzh",
+        "--whole-file",
+        "--files-from=-",
+        *extra_flags,
+        local_path,
+        remote_path,
+    ]
+
+    def push(shard):
+        subprocess.run(rsync_command, input="\n".join(shard), universal_newlines=True, check=True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(push, shard) for shard in shards if shard]:
+            future.result()
+
+    prune_command = [
+        "rsync",
+        "-e",
+        " ".join(SSH_COMMAND),
+        "-rh",
+        "--delete",
+        "--existing",
+        "--ignore-existing",
+        *extra_flags,
+        local_path,
+        remote_path,
+    ]
+    subprocess.run(prune_command, check=True)
+
+
+def mirror_remote_directory(source_paths_list, target_paths_list, extra_flags=()):
+    """
+    Mirror a directory on the remote into another remote directory without re-uploading it.
+
+    The copy is made by rsync on the remote host itself, with every unchanged file hardlinked
+    against the source directory.
+
+    :param source_paths_list: The list of parameters. e.g. ['en', '3.1.0'] to be en/3.1.0 on the
+        remote.
+    :type source_paths_list: a list of strings, with each string representing a directory.
+    :param target_paths_list: The list of parameters for the destination directory. An empty list
+        targets the site root.
+    :type target_paths_list: a list of strings, with each string representing a directory.
+    :param extra_flags: Additional flags passed to rsync.
+    :type extra_flags: a list of strings
+    """
+    source_path = SITE_ROOT + "/".join(source_paths_list) + "/"
+    target_path = SITE_ROOT + "".join(path + "/" for path in target_paths_list)
+    rsync_command = [
+        "rsync",
+        "-a",
+        "--delete",
+        "--omit-dir-times",
+        f"--link-dest={source_path}",
+        *extra_flags,
+        source_path,
+        target_path,
+    ]
+    # ssh hands the command to the remote shell as a single string
+    ssh_command = SSH_COMMAND + [REMOTE_HOST, " ".join(map(shlex.quote, rsync_command))]
+    subprocess.run(ssh_command, check=True)
 
 
 def ensure_dir(target_dir, clean=True):
     """
     Ensure that the directory specified exists and is empty.
 
-    By default this will delete the directory if it already exists
+    By default this will delete the directory if it already exists. The old directory is renamed
+    out of the way and removed in a background thread, so callers don't wait on the deletion.
+    Leftovers from runs that were interrupted before their deletion finished are removed too.
 
     :param target_dir: The directory to process
     :type target_dir: str
@@ -54,11 +167,26 @@ def ensure_dir(target_dir, clean=True):
     :type clean: bool
     """
     if clean:
-        rmtree(target_dir, ignore_errors=True)
-    try:
-        os.makedirs(target_dir)
-    except OSError:
-        pass
+        parent_dir, target_name = os.path.split(target_dir.rstrip(os.sep))
+        stale_prefix = os.path.join(parent_dir, f"{target_name}.stale.")
+        if os.path.isdir(target_dir):
+            # mkdtemp picks a name no leftover can already have, rename replaces the empty dir
+            os.rename(target_dir, tempfile.mkdtemp(prefix=f"{target_name}.stale.", dir=parent_dir))
+        stale_dirs = glob.glob(f"{glob.escape(stale_prefix)}*")
+        if stale_dirs:
+            threading.Thread(target=remove_dirs, args=(stale_dirs,)).start()
+    os.makedirs(target_dir, exist_ok=True)
+
+
+def remove_dirs(paths):
+    """
+    Remove the given directory trees, ignoring errors.
+
+    :param paths: The directories to remove
+    :type paths: a list of strings
+    """
+    for path in paths:
+        rmtree(path, ignore_errors=True)
 
 
 def main():
@@ -78,81 +206,68 @@ def main():
 
     ga_build = False
 
-    if not re.search("[a-zA-Z]", branch) and len(branch.split(".")) > 2:
+    if not ALPHA_RE.search(branch) and len(branch.split(".")) > 2:
         ga_build = True
 
     # build the docs via the Pulp project itself
     print("Building the docs")
-    docs_directory = os.sep.join([WORKING_DIR, "docs"])
+    docs_directory = os.path.join(WORKING_DIR, "docs")
+
+    # build on tmpfs when available, the output is thousands of small files re-read by rsync.
+    # The directory outlives the checkout, so it is emptied first: Sphinx never removes pages
+    # whose sources are gone, and they would be published.
+    build_directory = os.environ.get("DOCS_BUILD_DIR")
+    if not build_directory:
+        if os.path.isdir("/dev/shm"):
+            build_directory = "/dev/shm/pulp_ansible-docs"
+        else:
+            build_directory = os.path.join(docs_directory, "_build")
+    ensure_dir(build_directory)
 
-    make_command = ["make", "PULP_URL=http://pulp", "diagrams", "html"]
-    exit_code = subprocess.call(make_command, cwd=docs_directory)
-    if exit_code != 0:
-        raise RuntimeError("An error occurred while building the docs.")
+    make_command = [
+        "make",
+        "PULP_URL=http://pulp",
+        f"BUILDDIR={build_directory}",
+        "diagrams",
+        "html",
+    ]
+    subprocess.run(make_command, cwd=docs_directory, check=True)
     # rsync the docs
-    local_path_arg = os.sep.join([docs_directory, "_build", "html"]) + os.sep
+    local_path_arg = os.path.join(build_directory, "html", "")
+    open_ssh_master_connection()
     if build_type != "tag":
         # This is a nightly build
-        remote_path_arg = "%s@%s:%sen/%s/%s/" % (USERNAME, HOSTNAME, SITE_ROOT, branch, build_type)
-        make_directory_with_rsync(["en", branch, build_type])
-        rsync_command = ["rsync", "-avzh", "--delete", local_path_arg, remote_path_arg]
-        exit_code = subprocess.call(rsync_command, cwd=docs_directory)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while pushing docs.")
+        remote_path_arg = f"{REMOTE_ROOT}en/{branch}/{build_type}/"
+        make_remote_directory(["en", branch, build_type])
+        parallel_rsync(local_path_arg, remote_path_arg)
     elif ga_build:
         # This is a GA build.
-        # publish to the root of docs.pulpproject.org
-        version_components = branch.split(".")
-        x_y_version = "{}.{}".format(version_components[0], version_components[1])
-        remote_path_arg = "%s@%s:%s" % (USERNAME, HOSTNAME, SITE_ROOT)
-        rsync_command = [
-            "rsync",
-            "-avzh",
-            "--delete",
-            "--exclude",
-            "en",
-            "--omit-dir-times",
-            local_path_arg,
-            remote_path_arg,
-        ]
-        exit_code = subprocess.call(rsync_command, cwd=docs_directory)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while pushing docs.")
-        # publish to docs.pulpproject.org/en/3.y/
-        make_directory_with_rsync(["en", x_y_version])
-        remote_path_arg = "%s@%s:%sen/%s/" % (USERNAME, HOSTNAME, SITE_ROOT, x_y_version)
-        rsync_command = [
-            "rsync",
-            "-avzh",
-            "--delete",
-            "--omit-dir-times",
-            local_path_arg,
-            remote_path_arg,
-        ]
-        exit_code = subprocess.call(rsync_command, cwd=docs_directory)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while pushing docs.")
         # publish to docs.pulpproject.org/en/3.y.z/
-        make_directory_with_rsync(["en", branch])
-        remote_path_arg = "%s@%s:%sen/%s/" % (USERNAME, HOSTNAME, SITE_ROOT, branch)
-        rsync_command = [
-            "rsync",
-            "-avzh",
-            "--delete",
-            "--omit-dir-times",
-            local_path_arg,
-            remote_path_arg,
-        ]
-        exit_code = subprocess.call(rsync_command, cwd=docs_directory)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while pushing docs.")
+        version_components = branch.split(".")
+        x_y_version = f"{version_components[0]}.{version_components[1]}"
+        make_remote_directory(["en", branch])
+        remote_path_arg = f"{REMOTE_ROOT}en/{branch}/"
+        parallel_rsync(local_path_arg, remote_path_arg, ["--omit-dir-times"])
+        # publish to docs.pulpproject.org/en/3.y/ and to the root of docs.pulpproject.org by
+        # hardlinking the tree that was just uploaded, so nothing is transferred twice. Both
+        # targets only read en/3.y.z/, so they are mirrored concurrently.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(mirror_remote_directory, ["en", branch], ["en", x_y_version]),
+                executor.submit(mirror_remote_directory, ["en", branch], [], ["--exclude", "en"]),
+            ]
+            for future in futures:
+                future.result()
     else:
         # This is a pre-release
-        make_directory_with_rsync(["en", branch])
-        remote_path_arg = "%s@%s:%sen/%s/%s/" % (USERNAME, HOSTNAME, SITE_ROOT, branch, build_type)
+        make_remote_directory(["en", branch])
+        remote_path_arg = f"{REMOTE_ROOT}en/{branch}/{build_type}/"
         rsync_command = [
             "rsync",
+            "-e",
+            " ".join(SSH_COMMAND),
             "-avzh",
+            "--whole-file",
             "--delete",
             "--exclude",
             "nightly",
@@ -161,9 +276,7 @@ def main():
             local_path_arg,
             remote_path_arg,
         ]
-        exit_code = subprocess.call(rsync_command, cwd=docs_directory)
-        if exit_code != 0:
-            raise RuntimeError("An error occurred while pushing docs.")
+        subprocess.run(rsync_command, cwd=docs_directory, check=True)
 
 
 if __name__ == "__main__":
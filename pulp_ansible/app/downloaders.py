@@ -1,6 +1,8 @@
+from collections import OrderedDict
 from logging import getLogger
 import asyncio
 import backoff
+import hashlib
 import json
 
 from aiohttp import BasicAuth
@@ -37,6 +39,9 @@ class TokenAuthHttpDownloader(HttpDownloader):
     """
 
     TOKEN_LOCK = asyncio.Lock()
+    # access tokens keyed by a digest of the auth_url and refresh token, oldest first
+    ACCESS_TOKENS = OrderedDict()
+    ACCESS_TOKENS_MAX_SIZE = 32
 
     def __init__(
         self, url, auth_url, token, silence_errors_for_response_status_codes=None, **kwargs
@@ -89,12 +94,22 @@ class TokenAuthHttpDownloader(HttpDownloader):
 
         if not self.ansible_auth_url:
             # Galaxy Token
-            headers = {"Authorization": self.ansible_token}
-        else:
-            token = await self.update_token_from_auth_url()
-            # Keycloak Token
-            headers = {"Authorization": "Bearer {token}".format(token=token)}
-
+            return await self._get_with_headers({"Authorization": self.ansible_token})
+
+        # Keycloak Token
+        token = await self.get_or_update_token()
+        try:
+            return await self._get_with_headers({"Authorization": "Bearer {}".format(token)})
+        except ClientResponseError as exc:
+            if exc.status != 401:
+                raise
+        token = await self.get_or_update_token(expired_token=token)
+        return await self._get_with_headers({"Authorization": "Bearer {}".format(token)})
+
+    async def _get_with_headers(self, headers):
+        """
+        Download the `url` sending the given authorization headers.
+        """
         async with self.session.get(self.url, headers=headers, proxy=self.proxy) as response:
             self.raise_for_status(response)
             to_return = await self._handle_response(response)
@@ -104,22 +119,42 @@ class TokenAuthHttpDownloader(HttpDownloader):
             self.session.close()
         return to_return
 
-    async def update_token_from_auth_url(self):
+    async def get_or_update_token(self, expired_token=None):
         """
-        Update the Bearer token to be used with all requests.
+        Return the Bearer token shared by all downloaders using the same auth_url and token.
+
+        A new token is only requested from the auth_url the first time, or when the shared one
+        is still `expired_token`. Only the most recently refreshed tokens are kept, and the
+        refresh tokens themselves are never stored.
         """
+        key = hashlib.sha256(
+            "{} {}".format(self.ansible_auth_url, self.ansible_token).encode()
+        ).hexdigest()
         async with self.TOKEN_LOCK:
-            log.info("Updating bearer token")
-            form_payload = {
-                "grant_type": "refresh_token",
-                "client_id": "cloud-services",
-                "refresh_token": self.ansible_token,
-            }
-            url = self.ansible_auth_url
-            async with self.session.post(url, data=form_payload, raise_for_status=True) as response:
-                token_data = await response.text()
+            token = self.ACCESS_TOKENS.get(key)
+            if token is None or token == expired_token:
+                token = await self.update_token_from_auth_url()
+                self.ACCESS_TOKENS.pop(key, None)
+                self.ACCESS_TOKENS[key] = token
+                while len(self.ACCESS_TOKENS) > self.ACCESS_TOKENS_MAX_SIZE:
+                    self.ACCESS_TOKENS.popitem(last=False)
+            return token
 
-            return json.loads(token_data)["access_token"]
+    async def update_token_from_auth_url(self):
+        """
+        Request a new Bearer token from the auth_url.
+        """
+        log.info("Updating bearer token")
+        form_payload = {
+            "grant_type": "refresh_token",
+            "client_id": "cloud-services",
+            "refresh_token": self.ansible_token,
+        }
+        url = self.ansible_auth_url
+        async with self.session.post(url, data=form_payload, raise_for_status=True) as response:
+            token_data = await response.text()
+
+        return json.loads(token_data)["access_token"]
 
 
 class AnsibleDownloaderFactory(DownloaderFactory):
@@ -1,9 +1,10 @@
 from collections import defaultdict, namedtuple
-from datetime import datetime
 from gettext import gettext as _
 import semantic_version
 
-from django.db.models import Exists, OuterRef
+from django.contrib.postgres.fields import JSONField
+from django.db.models import Case, Exists, F, Func, IntegerField, OuterRef, Value, When
+from django.db.models.expressions import RawSQL
 from django.shortcuts import get_object_or_404
 from django.utils.datastructures import MultiValueDictKeyError
 from django.utils.dateparse import parse_datetime
@@ -52,19 +53,28 @@ class AnsibleDistributionMixin:
     A mixin for ViewSets that use AnsibleDistribution.
     """
 
-    @staticmethod
-    def get_repository_version(path):
-        """Returns repository version."""
-        distro = get_object_or_404(AnsibleDistribution, base_path=path)
-        if distro.repository_version:
-            return distro.repository_version
+    def get_repository_version(self, path):
+        """
+        Returns repository version.
+
+        The result is cached on the view, which lives for a single request.
+        """
+        repository_versions = self.__dict__.setdefault("_repository_versions", {})
+        if path not in repository_versions:
+            distro = get_object_or_404(
+                AnsibleDistribution.objects.select_related("repository", "repository_version"),
+                base_path=path,
+            )
+            if distro.repository_version:
+                repository_versions[path] = distro.repository_version
+            else:
+                repository_versions[path] = distro.repository.latest_version()
 
-        return distro.repository.latest_version()
+        return repository_versions[path]
 
-    @staticmethod
-    def get_distro_content(path):
+    def get_distro_content(self, path):
         """Returns distribution content."""
-        repo_version = AnsibleDistributionMixin.get_repository_version(path)
+        repo_version = self.get_repository_version(path)
         if repo_version is None:
             return Content.objects.none()
 
@@ -99,7 +109,7 @@ class CollectionVersionRetrieveMixin:
         Returns a CollectionVersion object.
         """
         instance = self.get_object()
-        artifact = ContentArtifact.objects.get(content=instance)
+        artifact = ContentArtifact.objects.select_related("artifact").get(content=instance)
 
         context = self.get_serializer_context()
         context["content_artifact"] = artifact
@@ -137,12 +147,20 @@ class CollectionViewSet(
             pass
         else:
             if user_deprecated_value.lower() in ["true", "yes", "1"]:
-                queryset = queryset.filter(deprecated=True)
+                deprecated_value = True
             elif user_deprecated_value.lower() in ["false", "no", "0"]:
-                queryset = queryset.filter(deprecated=False)
+                deprecated_value = False
             else:
                 raise ValidationError("Cannot parse value of `deprecated` GET parameter")
 
+            repo_version = self.get_repository_version(self.kwargs["path"])
+            deprecated_query = AnsibleCollectionDeprecated.objects.filter(
+                collection=OuterRef("pk"), repository_version=repo_version
+            )
+            queryset = queryset.annotate(deprecated=Exists(deprecated_query)).filter(
+                deprecated=deprecated_value
+            )
+
         return queryset
 
     def get_queryset(self):
@@ -150,13 +168,43 @@ class CollectionViewSet(
         Returns a Collections queryset for specified distribution.
         """
         repo_version = self.get_repository_version(self.kwargs["path"])
-        deprecated_query = AnsibleCollectionDeprecated.objects.filter(
-            collection=OuterRef("pk"), repository_version=repo_version
+        collection_ids = CollectionVersion.objects.filter(pk__in=repo_version.content).values(
+            "collection_id"
         )
-        collections = Collection.objects.filter(versions__in=repo_version.content).distinct()
-        collections = collections.annotate(deprecated=Exists(deprecated_query))
+        collections = Collection.objects.filter(pk__in=collection_ids)
 
-        versions_qs = CollectionVersion.objects.filter(pk__in=repo_version.content).values_list(
+        if "namespace" in self.kwargs and "name" in self.kwargs:
+            collections = collections.filter(
+                namespace=self.kwargs["namespace"], name=self.kwargs["name"]
+            )
+
+        return collections
+
+    def append_context(self, collections):
+        """
+        Computes the deprecation status and the highest and lowest versions of the collections.
+
+        Only the collections that are going to be serialized are looked up, so this is called on
+        a single page rather than on the whole queryset, which keeps the pagination count query
+        free of any per-row subquery.
+        """
+        repo_version = self.get_repository_version(self.kwargs["path"])
+        collection_ids = [c.pk for c in collections]
+
+        # filter_queryset() already annotates ``deprecated`` when the user filters on it
+        undecided = [c for c in collections if not hasattr(c, "deprecated")]
+        if undecided:
+            deprecated_ids = set(
+                AnsibleCollectionDeprecated.objects.filter(
+                    repository_version=repo_version, collection_id__in=[c.pk for c in undecided]
+                ).values_list("collection_id", flat=True)
+            )
+            for collection in undecided:
+                collection.deprecated = collection.pk in deprecated_ids
+
+        versions_qs = CollectionVersion.objects.filter(
+            pk__in=repo_version.content, collection_id__in=collection_ids
+        ).values_list(
             "collection_id",
             "namespace",
             "name",
@@ -180,26 +228,39 @@ class CollectionViewSet(
 
         self.highest_versions_context = highest_versions  # needed by get__serializer_context
         self.lowest_versions_context = lowest_versions  # needed by get__serializer_context
-        return collections
+
+    def paginate_queryset(self, queryset):
+        """
+        Paginates the queryset and computes the serializer context for the returned page.
+        """
+        page = super().paginate_queryset(queryset)
+        self.append_context(queryset if page is None else page)
+        return page
 
     def get_object(self):
         """
         Returns a Collection object.
         """
-        queryset = self.filter_queryset(self.get_queryset())
-        return get_object_or_404(
-            queryset, namespace=self.kwargs["namespace"], name=self.kwargs["name"]
-        )
+        return get_object_or_404(self.filter_queryset(self.get_queryset()))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns a Collection object with its versions context.
+        """
+        collection = self.get_object()
+        self.append_context([collection])
+        serializer = self.get_serializer(collection)
+        return Response(serializer.data)
 
     def get_serializer_context(self, *args, **kwargs):
         """
         Return the serializer context.
 
-        This uses super() but also adds in the "highest_versions" data from get_queryset()
+        This uses super() but also adds in the "highest_versions" data from append_context()
         """
         super_data = super().get_serializer_context()
-        super_data["highest_versions"] = self.highest_versions_context
-        super_data["lowest_versions"] = self.lowest_versions_context
+        super_data["highest_versions"] = getattr(self, "highest_versions_context", {})
+        super_data["lowest_versions"] = getattr(self, "lowest_versions_context", {})
         return super_data
 
     def update(self, request, *args, **kwargs):
@@ -212,9 +273,11 @@ class CollectionViewSet(
         serializer.is_valid(raise_exception=True)
         deprecated_value = serializer.validated_data["deprecated"]
         if deprecated_value:
-            AnsibleCollectionDeprecated.objects.get_or_create(
+            # a single INSERT ... ON CONFLICT DO NOTHING, the row may already exist
+            deprecation = AnsibleCollectionDeprecated(
                 repository_version=repo_version, collection=collection
             )
+            AnsibleCollectionDeprecated.objects.bulk_create([deprecation], ignore_conflicts=True)
         else:
             AnsibleCollectionDeprecated.objects.filter(
                 repository_version=repo_version, collection=collection
@@ -312,8 +375,28 @@ class CollectionVersionViewSet(
         Returns paginated CollectionVersions list.
         """
         queryset = self.filter_queryset(self.get_queryset())
-        queryset = sorted(
-            queryset, key=lambda obj: semantic_version.Version(obj.version), reverse=True
+        queryset = queryset.only(
+            "namespace",
+            "name",
+            "version",
+            "collection",
+            "collection__pulp_created",
+            "collection__pulp_last_updated",
+        )
+        queryset = queryset.order_by(
+            "-version_major",
+            "-version_minor",
+            "-version_patch",
+            # a release sorts higher than any of its prereleases
+            Case(
+                When(version_prerelease="", then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ).desc(),
+            # the prerelease sort key only compares correctly byte-wise
+            Func(F("version_prerelease"), template='%(expressions)s COLLATE "C"').desc(),
+            # versions differing only by their build metadata sort equal, keep the pages stable
+            "pk",
         )
 
         context = self.get_serializer_context()
@@ -350,7 +433,7 @@ class CollectionImportViewSet(
     ViewSet for CollectionImports.
     """
 
-    queryset = CollectionImport.objects.prefetch_related("task").all()
+    queryset = CollectionImport.objects.select_related("task").all()
     serializer_class = CollectionImportDetailSerializer
 
     since_filter = OpenApiParameter(
@@ -361,6 +444,31 @@ class CollectionImportViewSet(
         description="Filter messages since a given timestamp",
     )
 
+    def get_queryset(self):
+        """
+        Returns a CollectionImport queryset.
+
+        When the `since` parameter is given, the messages are filtered by Postgres and only the
+        matching ones are loaded.
+        """
+        queryset = super().get_queryset()
+
+        if "since" in self.request.query_params:
+            since = parse_datetime(self.request.query_params["since"]).timestamp()
+            filtered_messages = RawSQL(
+                "SELECT COALESCE(jsonb_agg(message ORDER BY position), '[]'::jsonb) "
+                "FROM jsonb_array_elements({table}.messages) WITH ORDINALITY "
+                "AS elements(message, position) "
+                "WHERE (message->>'time')::float > %s".format(
+                    table=CollectionImport._meta.db_table
+                ),
+                (since,),
+                output_field=JSONField(),
+            )
+            queryset = queryset.defer("messages").annotate(since_messages=filtered_messages)
+
+        return queryset
+
     @extend_schema(parameters=[since_filter])
     def retrieve(self, request, *args, **kwargs):
         """
@@ -369,13 +477,7 @@ class CollectionImportViewSet(
         instance = self.get_object()
 
         if "since" in self.request.query_params:
-            since = parse_datetime(self.request.query_params["since"])
-            messages = []
-            for message in instance.messages:
-                message_time = datetime.fromtimestamp(message["time"])
-                if message_time.replace(tzinfo=since.tzinfo) > since:
-                    messages.append(message)
-            instance.messages = messages
+            instance.messages = instance.since_messages
 
         context = self.get_serializer_context()
         serializer = CollectionImportDetailSerializer(instance, context=context)
@@ -1,5 +1,3 @@
-import re
-
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, pagination, response, views
@@ -20,6 +18,18 @@ from .serializers import (
 )
 
 
+class DistributionPathContextMixin:
+    """
+    A mixin for views whose serializers build links with the distribution path.
+    """
+
+    def get_serializer_context(self):
+        """Inserts distribution path to a serializer context."""
+        context = super().get_serializer_context()
+        context["path"] = self.kwargs["path"]
+        return context
+
+
 class GalaxyVersionView(views.APIView):
     """
     APIView for Galaxy versions.
@@ -92,14 +102,19 @@ class RoleVersionList(generics.ListAPIView):
             distro_content = distro.repository_version.content
         else:
             distro_content = distro.repository.latest_version().content
-        namespace, name = re.split(r"\.", self.kwargs["role_pk"])
-        versions = Role.objects.filter(pk__in=distro_content, name=name, namespace=namespace)
-        for version in versions:
-            version.distro_path = distro.base_path
-        return versions
+        namespace, name = self.kwargs["role_pk"].split(".", 1)
+        return Role.objects.filter(pk__in=distro_content, name=name, namespace=namespace)
+
+    def get_serializer_context(self):
+        """Inserts the distribution's content URL to a serializer context."""
+        context = super().get_serializer_context()
+        context["distro_path"] = "".join(
+            [settings.CONTENT_ORIGIN, settings.CONTENT_PATH_PREFIX, self.kwargs["path"]]
+        )
+        return context
 
 
-class GalaxyCollectionDetailView(generics.RetrieveAPIView):
+class GalaxyCollectionDetailView(DistributionPathContextMixin, generics.RetrieveAPIView):
     """
     View for a Collection Detail.
     """
@@ -114,11 +129,13 @@ class GalaxyCollectionDetailView(generics.RetrieveAPIView):
         Get the detail view of a Collection.
         """
         collection = get_object_or_404(Collection, namespace=namespace, name=name)
-        collection.path = path
-        return response.Response(GalaxyCollectionSerializer(collection).data)
+        context = self.get_serializer_context()
+        return response.Response(GalaxyCollectionSerializer(collection, context=context).data)
 
 
-class GalaxyCollectionView(generics.ListAPIView, UploadGalaxyCollectionMixin):
+class GalaxyCollectionView(
+    DistributionPathContextMixin, generics.ListAPIView, UploadGalaxyCollectionMixin
+):
     """
     View for Collection models.
     """
@@ -139,12 +156,10 @@ class GalaxyCollectionView(generics.ListAPIView, UploadGalaxyCollectionMixin):
         else:
             distro_content = distro.repository.latest_version().content
 
-        collections = Collection.objects.filter(versions__pk__in=distro_content).distinct()
-
-        for c in collections:
-            c.path = self.kwargs["path"]  # annotation needed by the serializer
-
-        return collections
+        collection_ids = CollectionVersion.objects.filter(pk__in=distro_content).values(
+            "collection_id"
+        )
+        return Collection.objects.filter(pk__in=collection_ids)
 
     def post(self, request, path):
         """
@@ -163,7 +178,7 @@ class GalaxyCollectionView(generics.ListAPIView, UploadGalaxyCollectionMixin):
         return OperationPostponedResponse(async_result, request)
 
 
-class GalaxyCollectionVersionList(generics.ListAPIView):
+class GalaxyCollectionVersionList(DistributionPathContextMixin, generics.ListAPIView):
     """
     APIView for Collections by namespace/name.
     """
@@ -187,12 +202,7 @@ class GalaxyCollectionVersionList(generics.ListAPIView):
         collection = get_object_or_404(
             Collection, namespace=self.kwargs["namespace"], name=self.kwargs["name"]
         )
-        versions = collection.versions.filter(pk__in=distro_content)
-
-        for c in versions:
-            c.path = self.kwargs["path"]  # annotation needed by the serializer
-
-        return versions
+        return collection.versions.filter(pk__in=distro_content)
 
 
 class GalaxyCollectionVersionDetail(views.APIView):
@@ -227,7 +237,6 @@ class GalaxyCollectionVersionDetail(views.APIView):
             relative_path=version.relative_path,
         )
 
-        version.path = path
-        data = GalaxyCollectionVersionSerializer(version).data
+        data = GalaxyCollectionVersionSerializer(version, context={"path": path}).data
         data["download_url"] = download_url
         return response.Response(data)
@@ -7,22 +7,36 @@ import uuid
 
 
 def migrate_deprecated(apps, schema_editor):
-    Collection = apps.get_model('ansible', 'Collection')
+    CollectionVersion = apps.get_model('ansible', 'CollectionVersion')
     AnsibleCollectionDeprecated = apps.get_model('ansible', 'AnsibleCollectionDeprecated')
+    RepositoryContent = apps.get_model('core', 'RepositoryContent')
     RepositoryVersion = apps.get_model('core', 'RepositoryVersion')
-    for collection in Collection.objects.filter(deprecated=True):
-        for cv in collection.versions.all():
-            for repository_content in cv.version_memberships.all():
-                version_removed_kwarg = {}
-                if repository_content.version_removed:
-                    version_removed_kwarg['number__lte'] = repository_content.version_removed.number
-                for repository_version in RepositoryVersion.objects.filter(
-                        repository=repository_content.repository,
-                        number__gte=repository_content.version_added.number,
-                        **version_removed_kwarg):
-                    AnsibleCollectionDeprecated.objects.get_or_create(
-                        collection=collection, repository_version=repository_version
-                    )
+    deprecated_versions = CollectionVersion.objects.filter(collection__deprecated=True)
+    collection_ids = dict(deprecated_versions.values_list('pk', 'collection_id'))
+    repository_contents = RepositoryContent.objects.filter(
+        content_id__in=deprecated_versions.values('pk')
+    ).select_related('version_added', 'version_removed')
+    deprecations = set()
+    for repository_content in repository_contents.iterator(chunk_size=2000):
+        version_removed_kwarg = {}
+        if repository_content.version_removed:
+            version_removed_kwarg['number__lte'] = repository_content.version_removed.number
+        repository_version_pks = RepositoryVersion.objects.filter(
+            repository_id=repository_content.repository_id,
+            number__gte=repository_content.version_added.number,
+            **version_removed_kwarg,
+        ).values_list('pk', flat=True)
+        collection_id = collection_ids[repository_content.content_id]
+        for repository_version_pk in repository_version_pks.iterator(chunk_size=2000):
+            deprecations.add((collection_id, repository_version_pk))
+
+    AnsibleCollectionDeprecated.objects.bulk_create(
+        [
+            AnsibleCollectionDeprecated(collection_id=collection_id, repository_version_id=rv_id)
+            for collection_id, rv_id in deprecations
+        ],
+        batch_size=1000,
+    )
 
 
 class Migration(migrations.Migration):
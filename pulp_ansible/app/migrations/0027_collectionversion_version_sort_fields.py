@@ -0,0 +1,73 @@
+from django.db import migrations, models
+import semantic_version
+
+# the largest value a BigIntegerField can hold, bigger version numbers sort as equal to it
+MAX_VERSION_NUMBER = 9223372036854775807
+
+
+def prerelease_sort_key(prerelease):
+    return "".join(
+        (
+            "0{:03d}{}!".format(len(identifier), identifier)
+            if identifier.isdigit()
+            else "1{}!".format(identifier)
+        )
+        for identifier in prerelease
+    )
+
+
+def populate_version_sort_fields(apps, schema_editor):
+    CollectionVersion = apps.get_model("ansible", "CollectionVersion")
+    fields = ["version_major", "version_minor", "version_patch", "version_prerelease"]
+
+    batch = []
+    collection_versions = CollectionVersion.objects.only("pk", "version")
+    for collection_version in collection_versions.iterator(chunk_size=2000):
+        version = semantic_version.Version(collection_version.version)
+        collection_version.version_major = min(version.major, MAX_VERSION_NUMBER)
+        collection_version.version_minor = min(version.minor, MAX_VERSION_NUMBER)
+        collection_version.version_patch = min(version.patch, MAX_VERSION_NUMBER)
+        collection_version.version_prerelease = prerelease_sort_key(version.prerelease)
+        batch.append(collection_version)
+        if len(batch) == 1000:
+            CollectionVersion.objects.bulk_update(batch, fields, batch_size=1000)
+            batch = []
+    if batch:
+        CollectionVersion.objects.bulk_update(batch, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ansible", "0026_deprecation_per_repository"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="collectionversion",
+            name="version_major",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="collectionversion",
+            name="version_minor",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="collectionversion",
+            name="version_patch",
+            field=models.BigIntegerField(default=0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="collectionversion",
+            name="version_prerelease",
+            field=models.TextField(default="", editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            code=populate_version_sort_fields, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -115,6 +115,11 @@ class CollectionVersion(Content):
         namespace (models.CharField): The namespace of the collection.
         repository (models.CharField): The URL of the originating SCM repository.
         version (models.CharField): The version of the collection.
+        version_major (models.BigIntegerField): The major part of the version, used for sorting.
+        version_minor (models.BigIntegerField): The minor part of the version, used for sorting.
+        version_patch (models.BigIntegerField): The patch part of the version, used for sorting.
+        version_prerelease (models.TextField): A sort key encoding the prerelease part of the
+            version, compared byte-wise to follow the semver precedence rules.
         is_highest (models.BooleanField): Indicates that the version is the highest one
             in the collection.
 
@@ -140,6 +145,10 @@ class CollectionVersion(Content):
     namespace = models.CharField(max_length=32, editable=False)
     repository = models.CharField(default="", blank=True, max_length=2000, editable=False)
     version = models.CharField(max_length=128, editable=False)
+    version_major = models.BigIntegerField(editable=False)
+    version_minor = models.BigIntegerField(editable=False)
+    version_patch = models.BigIntegerField(editable=False)
+    version_prerelease = models.TextField(editable=False)
 
     is_highest = models.BooleanField(editable=False, default=False)
 
@@ -57,6 +57,9 @@ from pulp_ansible.app.tasks.utils import (
 
 log = logging.getLogger(__name__)
 
+# the largest value a BigIntegerField can hold, bigger version numbers sort as equal to it
+MAX_VERSION_NUMBER = 9223372036854775807
+
 
 def sync(remote_pk, repository_pk, mirror):
     """
@@ -183,6 +186,7 @@ def create_collection_from_importer(importer_result):
         collection_version = CollectionVersion(
             collection=collection,
             **collection_info,
+            **_get_version_sort_fields(collection_info["version"]),
             contents=importer_result["contents"],
             docs_blob=importer_result["docs_blob"],
         )
@@ -207,6 +211,32 @@ def create_collection_from_importer(importer_result):
     return collection_version
 
 
+def _get_version_sort_fields(version):
+    """
+    Returns the CollectionVersion fields that allow sorting by semantic version in the database.
+
+    The prerelease identifiers are encoded so that a byte-wise comparison follows the semver
+    precedence rules: numeric identifiers are prefixed with "0" and their length, so they compare
+    numerically and below the alphanumeric ones prefixed with "1", and every identifier ends with
+    "!", which sorts below any character allowed in an identifier.
+    """
+    version = semver.Version(version)
+    prerelease = "".join(
+        (
+            "0{:03d}{}!".format(len(identifier), identifier)
+            if identifier.isdigit()
+            else "1{}!".format(identifier)
+        )
+        for identifier in version.prerelease
+    )
+    return {
+        "version_major": min(version.major, MAX_VERSION_NUMBER),
+        "version_minor": min(version.minor, MAX_VERSION_NUMBER),
+        "version_patch": min(version.patch, MAX_VERSION_NUMBER),
+        "version_prerelease": prerelease,
+    }
+
+
 def _update_highest_version(collection_version):
     """
     Checks if this version is greater than the most highest one.
@@ -295,6 +325,7 @@ class CollectionSyncFirstStage(Stage):
                     namespace=metadata["namespace"]["name"],
                     name=metadata["collection"]["name"],
                     version=metadata["version"],
+                    **_get_version_sort_fields(metadata["version"]),
                 )
 
                 info = metadata["metadata"]
@@ -77,7 +77,7 @@ class RoleViewSet(ContentViewSet):
     """
 
     endpoint_name = "roles"
-    queryset = Role.objects.all()
+    queryset = Role.objects.prefetch_related("_artifacts")
     serializer_class = RoleSerializer
     filterset_class = RoleFilter
 
@@ -214,7 +214,7 @@ class AnsibleRepositoryViewSet(RepositoryViewSet, ModifyRepositoryActionMixin):
     """
 
     endpoint_name = "ansible"
-    queryset = AnsibleRepository.objects.all()
+    queryset = AnsibleRepository.objects.select_related("remote")
     serializer_class = AnsibleRepositorySerializer
 
     @extend_schema(
@@ -18,8 +18,12 @@ from pulp_ansible.tests.functional.constants import (
     ANSIBLE_DEMO_COLLECTION_REQUIREMENTS as DEMO_REQUIREMENTS,
     GALAXY_ANSIBLE_BASE_URL,
 )
-from pulp_ansible.tests.functional.utils import gen_ansible_client, gen_ansible_remote, monitor_task
-from pulp_ansible.tests.functional.utils import set_up_module as setUpModule  # noqa:F401
+from pulp_ansible.tests.functional.utils import (  # noqa:F401
+    gen_ansible_client,
+    gen_ansible_remote,
+    monitor_task,
+    set_up_module as setUpModule,
+)
 
 
 class PulpToPulpSyncCase(unittest.TestCase):
@@ -77,8 +81,13 @@ class PulpToPulpSyncCase(unittest.TestCase):
         self.assertEqual(mirror_repo.latest_version_href, f"{mirror_repo.pulp_href}versions/1/")
 
         # Check content of both repos.
-        original_content = self.cv_api.list(repository_version=f"{repo.pulp_href}versions/1/")
-        mirror_content = self.cv_api.list(repository_version=f"{mirror_repo.pulp_href}versions/1/")
+        original_content = self.cv_api.list(
+            repository_version=f"{repo.pulp_href}versions/1/", async_req=True
+        )
+        mirror_content = self.cv_api.list(
+            repository_version=f"{mirror_repo.pulp_href}versions/1/", async_req=True
+        )
+        original_content, mirror_content = original_content.get(), mirror_content.get()
         self.assertTrue(mirror_content.results)  # check that we have some results
         self.assertEqual(sorted(original_content.results), sorted(mirror_content.results))
 
@@ -1,5 +1,3 @@
-from urllib.parse import urljoin
-
 from pulp_smash.pulp3.constants import (
     BASE_DISTRIBUTION_PATH,
     BASE_PUBLISHER_PATH,
@@ -14,19 +12,19 @@ GALAXY_ANSIBLE_BASE_URL = "https://galaxy.ansible.com"
 
 ANSIBLE_ROLE_NAME = "ansible.role"
 
-ANSIBLE_ROLE_CONTENT_PATH = urljoin(BASE_CONTENT_PATH, "ansible/roles/")
+ANSIBLE_ROLE_CONTENT_PATH = f"{BASE_CONTENT_PATH}ansible/roles/"
 
-ANSIBLE_COLLECTION_VERSION_CONTENT_PATH = urljoin(BASE_CONTENT_PATH, "ansible/collection_versions/")
+ANSIBLE_COLLECTION_VERSION_CONTENT_PATH = f"{BASE_CONTENT_PATH}ansible/collection_versions/"
 
-ANSIBLE_DISTRIBUTION_PATH = urljoin(BASE_DISTRIBUTION_PATH, "ansible/ansible/")
+ANSIBLE_DISTRIBUTION_PATH = f"{BASE_DISTRIBUTION_PATH}ansible/ansible/"
 
-ANSIBLE_REMOTE_PATH = urljoin(BASE_REMOTE_PATH, "ansible/role/")
+ANSIBLE_REMOTE_PATH = f"{BASE_REMOTE_PATH}ansible/role/"
 
-ANSIBLE_REPO_PATH = urljoin(BASE_REPO_PATH, "ansible/ansible/")
+ANSIBLE_REPO_PATH = f"{BASE_REPO_PATH}ansible/ansible/"
 
-ANSIBLE_PUBLISHER_PATH = urljoin(BASE_PUBLISHER_PATH, "ansible/ansible/")
+ANSIBLE_PUBLISHER_PATH = f"{BASE_PUBLISHER_PATH}ansible/ansible/"
 
-ANSIBLE_GALAXY_URL = urljoin(GALAXY_ANSIBLE_BASE_URL, "api/v1/roles/")
+ANSIBLE_GALAXY_URL = f"{GALAXY_ANSIBLE_BASE_URL}/api/v1/roles/"
 
 NAMESPACE_ANSIBLE = "?namespace__name=ansible"
 
@@ -36,11 +34,11 @@ NAMESPACE_PULP = "?namespace__name=pulp"
 
 NAMESPACE_TESTING = "?namespace__name=testing"
 
-ANSIBLE_FIXTURE_URL = urljoin(ANSIBLE_GALAXY_URL, NAMESPACE_ANSIBLE)
+ANSIBLE_FIXTURE_URL = f"{ANSIBLE_GALAXY_URL}{NAMESPACE_ANSIBLE}"
 
-ANSIBLE_PULP_FIXTURE_URL = urljoin(ANSIBLE_GALAXY_URL, NAMESPACE_PULP)
+ANSIBLE_PULP_FIXTURE_URL = f"{ANSIBLE_GALAXY_URL}{NAMESPACE_PULP}"
 
-ANSIBLE_ELASTIC_FIXTURE_URL = urljoin(ANSIBLE_GALAXY_URL, NAMESPACE_ELASTIC)
+ANSIBLE_ELASTIC_FIXTURE_URL = f"{ANSIBLE_GALAXY_URL}{NAMESPACE_ELASTIC}"
 
 ANSIBLE_ELASTIC_ROLE_NAMESPACE_NAME = "elastic.elasticsearch"
 
@@ -51,9 +49,9 @@ ANSIBLE_FIXTURE_COUNT = 5
 ANSIBLE_FIXTURE_CONTENT_SUMMARY = {ANSIBLE_ROLE_NAME: ANSIBLE_FIXTURE_COUNT}
 
 # FIXME: replace this with the location of one specific content unit of your choosing
-ANSIBLE_URL = urljoin(ANSIBLE_FIXTURE_URL, "")
+ANSIBLE_URL = ANSIBLE_FIXTURE_URL
 
-ANSIBLE_COLLECTION_REMOTE_PATH = urljoin(BASE_REMOTE_PATH, "ansible/collection/")
+ANSIBLE_COLLECTION_REMOTE_PATH = f"{BASE_REMOTE_PATH}ansible/collection/"
 
 ANSIBLE_DEMO_COLLECTION = "testing.k8s_demo_collection"
 
@@ -73,8 +71,8 @@ https://galaxy.ansible.com/api/v2/collections/testing/k8s_demo_collection/versio
 
 ANSIBLE_COLLECTION_FILE_NAME = "testing-k8s_demo_collection-0.0.3.tar.gz"
 
-ANSIBLE_COLLECTION_UPLOAD_FIXTURE_URL = urljoin(
-    GALAXY_ANSIBLE_BASE_URL, f"download/{ANSIBLE_COLLECTION_FILE_NAME}"
+ANSIBLE_COLLECTION_UPLOAD_FIXTURE_URL = (
+    f"{GALAXY_ANSIBLE_BASE_URL}/download/{ANSIBLE_COLLECTION_FILE_NAME}"
 )
 
 ANSIBLE_COLLECTION_REQUIREMENT = """
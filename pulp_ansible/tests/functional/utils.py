@@ -1,6 +1,6 @@
 # coding=utf-8
 """Utilities for tests for the ansible plugin."""
-from functools import partial
+from functools import lru_cache, partial
 from unittest import SkipTest
 from time import sleep
 
@@ -40,9 +40,11 @@ def set_up_module():
     require_pulp_plugins({"pulp_ansible"}, SkipTest)
 
 
+@lru_cache(maxsize=None)
 def gen_ansible_client():
-    """Return an OBJECT for ansible client."""
-    return AnsibleApiClient(configuration)
+    """Return an OBJECT for ansible client, shared by all the test classes."""
+    # requests made with async_req=True run on a pool of this size, one thread is sequential
+    return AnsibleApiClient(configuration, pool_threads=2)
 
 
 def gen_ansible_remote(url=ANSIBLE_FIXTURE_URL, **kwargs):
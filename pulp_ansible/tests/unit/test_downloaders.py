@@ -0,0 +1,77 @@
+import asyncio
+from unittest import mock
+
+from aiohttp.client_exceptions import ClientResponseError
+from django.test import TestCase
+
+from pulp_ansible.app.downloaders import TokenAuthHttpDownloader
+
+AUTH_URL = "https://sso.example.com/token"
+
+
+class TestTokenAuthHttpDownloader(TestCase):
+    """Test the access token handling of TokenAuthHttpDownloader."""
+
+    def setUp(self):
+        """Start every test with an empty token cache."""
+        TokenAuthHttpDownloader.ACCESS_TOKENS.clear()
+        self.refreshed = []
+        self.requests = []
+
+    def _downloader(self, responses, token="refresh-token"):
+        """Return a downloader answering its requests with the given statuses, in order."""
+        downloader = TokenAuthHttpDownloader(
+            "https://example.com/file.tar.gz", AUTH_URL, token, session=mock.Mock()
+        )
+
+        async def update_token_from_auth_url():
+            self.refreshed.append(token)
+            return "access-{}".format(len(self.refreshed))
+
+        async def get_with_headers(headers):
+            self.requests.append(headers["Authorization"])
+            status = responses.pop(0)
+            if status != 200:
+                raise ClientResponseError(mock.Mock(), (), status=status)
+            return status
+
+        downloader.update_token_from_auth_url = update_token_from_auth_url
+        downloader._get_with_headers = get_with_headers
+        return downloader
+
+    def _run(self, downloader):
+        return asyncio.get_event_loop().run_until_complete(downloader._run())
+
+    def test_access_token_is_shared(self):
+        """Test that downloaders with the same auth_url and token share one access token."""
+        self._run(self._downloader([200]))
+        self._run(self._downloader([200]))
+
+        self.assertEqual(len(self.refreshed), 1)
+        self.assertEqual(self.requests, ["Bearer access-1", "Bearer access-1"])
+
+    def test_expired_access_token_is_refreshed_once(self):
+        """Test that a 401 refreshes the access token and retries the download once."""
+        self.assertEqual(self._run(self._downloader([401, 200])), 200)
+
+        self.assertEqual(len(self.refreshed), 2)
+        self.assertEqual(self.requests, ["Bearer access-1", "Bearer access-2"])
+        self.assertEqual(list(TokenAuthHttpDownloader.ACCESS_TOKENS.values()), ["access-2"])
+
+    def test_second_401_is_raised(self):
+        """Test that a download still unauthorized with a fresh access token fails."""
+        with self.assertRaises(ClientResponseError):
+            self._run(self._downloader([401, 401]))
+
+        self.assertEqual(len(self.refreshed), 2)
+        self.assertEqual(len(self.requests), 2)
+
+    def test_cache_is_bounded_and_hides_refresh_tokens(self):
+        """Test that the cache keeps a bounded number of entries not keyed by the tokens."""
+        size = TokenAuthHttpDownloader.ACCESS_TOKENS_MAX_SIZE
+        for i in range(size + 1):
+            self._run(self._downloader([200], token="refresh-{}".format(i)))
+
+        self.assertEqual(len(TokenAuthHttpDownloader.ACCESS_TOKENS), size)
+        for key in TokenAuthHttpDownloader.ACCESS_TOKENS:
+            self.assertNotIn("refresh-", key)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+import semantic_version
+
+from pulp_ansible.app.tasks.collections import _get_version_sort_fields
+
+
+class TestVersionSortFields(TestCase):
+    """Test the CollectionVersion sort fields."""
+
+    def test_sort_fields_follow_semver_precedence(self):
+        """Test that ordering by the sort fields matches the semantic version ordering."""
+        versions = [
+            "2.0.0",
+            "1.0.0",
+            "1.0.0-rc.9",
+            "1.0.0-rc.10",
+            "1.0.0-2",
+            "1.0.0-10",
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha-b",
+            "1.0.0-alpha.beta",
+            "1.0.0-Beta",
+            "1.0.0-beta",
+            "1.0.1-rc.1",
+            "0.10.0",
+            "0.9.10",
+        ]
+
+        def sort_key(version):
+            # mirrors the ordering of the v3 collection versions list
+            fields = _get_version_sort_fields(version)
+            return (
+                fields["version_major"],
+                fields["version_minor"],
+                fields["version_patch"],
+                fields["version_prerelease"] == "",
+                fields["version_prerelease"].encode(),
+            )
+
+        self.assertEqual(
+            sorted(versions, key=sort_key), sorted(versions, key=semantic_version.Version)
+        )
+        self.assertLess(sort_key("1.0.0-rc.9"), sort_key("1.0.0-rc.10"))
+        self.assertLess(sort_key("1.0.0-2"), sort_key("1.0.0-10"))
+
+    def test_sort_fields_fit_in_the_columns(self):
+        """Test that version numbers beyond the columns' range are clamped."""
+        fields = _get_version_sort_fields("20201015123000.99999999999999999999.0")
+        self.assertEqual(fields["version_major"], 20201015123000)
+        self.assertEqual(fields["version_minor"], 2 ** 63 - 1)
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from pulpcore.plugin.models import Task
+
+from pulp_ansible.app.galaxy.v3.views import CollectionImportViewSet
+from pulp_ansible.app.models import CollectionImport
+
+# 2020-09-13T12:26:40+00:00
+MESSAGE_TIME = 1600000000.0
+
+
+class TestCollectionImportSince(TestCase):
+    """Test the `since` filter of the CollectionImport detail view."""
+
+    def setUp(self):
+        """Create a CollectionImport with messages 10 seconds apart."""
+        self.user = get_user_model().objects.create(username="collection-import-test")
+        task = Task.objects.create(name="import_collection", state="completed")
+        self.collection_import = CollectionImport.objects.create(
+            task=task,
+            messages=[
+                {"message": "first", "level": "INFO", "time": MESSAGE_TIME},
+                {"message": "second", "level": "INFO", "time": MESSAGE_TIME + 10},
+                {"message": "third", "level": "INFO", "time": MESSAGE_TIME + 20},
+            ],
+        )
+
+    def _get_messages(self, since):
+        request = APIRequestFactory().get("/", {"since": since})
+        force_authenticate(request, user=self.user)
+        view = CollectionImportViewSet.as_view({"get": "retrieve"})
+        response = view(request, pk=str(self.collection_import.pk))
+        self.assertEqual(response.status_code, 200)
+        return [message["message"] for message in response.data["messages"]]
+
+    def test_since_utc(self):
+        """Test that only the messages logged after `since` are returned."""
+        self.assertEqual(self._get_messages("2020-09-13T12:26:45+00:00"), ["second", "third"])
+
+    def test_since_with_utc_offset(self):
+        """Test that `since` is compared as an instant, whatever its UTC offset."""
+        self.assertEqual(self._get_messages("2020-09-13T14:26:45+02:00"), ["second", "third"])
+        self.assertEqual(
+            self._get_messages("2020-09-13T12:26:45+02:00"), ["first", "second", "third"]
+        )
+
+    def test_since_keeps_message_order(self):
+        """Test that the messages filtered in the database keep their logged order."""
+        self.collection_import.messages = list(reversed(self.collection_import.messages))
+        self.collection_import.save()
+        self.assertEqual(self._get_messages("2020-09-13T12:26:45+00:00"), ["third", "second"])
+
+    def test_since_after_last_message(self):
+        """Test that an empty list is returned when no message was logged after `since`."""
+        self.assertEqual(self._get_messages("2020-09-13T12:30:00+00:00"), [])